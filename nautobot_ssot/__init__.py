@@ -1,18 +1,20 @@
 """App declaration for nautobot_ssot."""
 
 import os
-from importlib import metadata
-
 
 from django.conf import settings
-from nautobot.extras.plugins import NautobotAppConfig
-from nautobot.core.settings_funcs import is_truthy
 import packaging
 
 from nautobot_ssot.integrations.utils import each_enabled_integration_module
 from nautobot_ssot.utils import logger
 
-__version__ = metadata.version(__name__)
+try:
+    # Generated for the release builds, avoids a package metadata lookup on every import.
+    from nautobot_ssot._version import __version__
+except ImportError:
+    from importlib import metadata
+
+    __version__ = metadata.version(__name__)
 
 
 _CONFLICTING_APP_NAMES = [
@@ -30,8 +32,10 @@ _MIN_NAUTOBOT_VERSION = {
 
 
 def _check_min_nautobot_version_met():
+    # Nautobot already resolved its own version from the package metadata when it was imported, reuse it.
+    from nautobot import __version__ as nautobot_version  # pylint: disable=import-outside-toplevel
+
     incompatible_apps_msg = []
-    nautobot_version = metadata.version("nautobot")
     for app, nb_ver in _MIN_NAUTOBOT_VERSION.items():
         if packaging.version.parse(nb_ver) > packaging.version.parse(nautobot_version):
             incompatible_apps_msg.append(f"The `{app}` requires Nautobot version {nb_ver} or higher.\n")
@@ -52,26 +56,24 @@ def _check_for_conflicting_apps():
         )
 
 
-if not is_truthy(os.getenv("NAUTOBOT_SSOT_ALLOW_CONFLICTING_APPS", "False")):
-    _check_for_conflicting_apps()
-
-_check_min_nautobot_version_met()
-
-
-class NautobotSSOTAppConfig(NautobotAppConfig):
-    """App configuration for the nautobot_ssot app."""
+# Built once at import time. `NautobotAppConfig.validate()` requires a real `dict`, not a read-only mapping.
+_DEFAULT_SETTINGS = {
+    "enable_aci": False,
+    "enable_aristacv": False,
+    "enable_device42": False,
+    "enable_infoblox": False,
+    "enable_ipfabric": False,
+    "enable_servicenow": False,
+    "enable_itential": False,
+    "hide_example_jobs": True,
+}
 
-    name = "nautobot_ssot"
-    verbose_name = "Single Source of Truth"
-    version = __version__
-    author = "Network to Code, LLC"
-    description = "Nautobot app that enables Single Source of Truth.  Allows users to aggregate distributed data sources and/or distribute Nautobot data to other data sources such as databases and SDN controllers."
-    base_url = "ssot"
-    required_settings = []
-    min_version = "2.0.0"
-    max_version = "2.9999"
-    default_settings = {
-        "aci_apics": [],
+# Integration specific defaults, only applied when the integration is enabled with `enable_<integration>`.
+# Nautobot assigns these values to `PLUGINS_CONFIG` by reference, empty sequences are immutable tuples so the
+# shared defaults can't be mutated in place.
+_INTEGRATIONS_DEFAULT_SETTINGS = {
+    "aci": {
+        "aci_apics": (),
         "aci_tag": "",
         "aci_tag_color": "",
         "aci_tag_up": "",
@@ -79,9 +81,11 @@ class NautobotSSOTAppConfig(NautobotAppConfig):
         "aci_tag_down": "",
         "aci_tag_down_color": "",
         "aci_manufacturer_name": "",
-        "aci_ignore_tenants": [],
+        "aci_ignore_tenants": (),
         "aci_comments": "",
         "aci_site": "",
+    },
+    "aristacv": {
         "aristacv_apply_import_tag": False,
         "aristacv_controller_site": "",
         "aristacv_create_controller": False,
@@ -95,12 +99,14 @@ class NautobotSSOTAppConfig(NautobotAppConfig):
         "aristacv_from_cloudvision_default_device_role": "",
         "aristacv_from_cloudvision_default_device_role_color": "",
         "aristacv_from_cloudvision_default_site": "",
-        "aristacv_hostname_patterns": [],
+        "aristacv_hostname_patterns": (),
         "aristacv_import_active": False,
         "aristacv_external_integration_name": "",
         "aristacv_role_mappings": {},
         "aristacv_site_mappings": {},
         "aristacv_verify": True,
+    },
+    "device42": {
         "device42_host": "",
         "device42_username": "",
         "device42_password": "",
@@ -111,34 +117,101 @@ class NautobotSSOTAppConfig(NautobotAppConfig):
         "device42_facility_prepend": "",
         "device42_role_prepend": "",
         "device42_ignore_tag": "",
-        "device42_hostname_mapping": [],
-        "enable_aci": False,
-        "enable_aristacv": False,
-        "enable_device42": False,
-        "enable_infoblox": False,
-        "enable_ipfabric": False,
-        "enable_servicenow": False,
-        "enable_itential": False,
-        "hide_example_jobs": True,
+        "device42_hostname_mapping": (),
+    },
+    "ipfabric": {
         "ipfabric_api_token": "",
         "ipfabric_host": "",
         "ipfabric_ssl_verify": True,
         "ipfabric_timeout": 15,
         "ipfabric_nautobot_host": "",
+    },
+    "servicenow": {
         "servicenow_instance": "",
         "servicenow_password": "",
         "servicenow_username": "",
-    }
-    caching_config = {}
-    config_view_name = "plugins:nautobot_ssot:config"
+    },
+}
+
+
+def _get_default_settings():
+    """Return the app default settings, including the defaults of enabled integrations only."""
+    config = settings.PLUGINS_CONFIG.get("nautobot_ssot", {})
+    default_settings = dict(_DEFAULT_SETTINGS)
+    for integration, integration_settings in _INTEGRATIONS_DEFAULT_SETTINGS.items():
+        if config.get(f"enable_{integration}", False):
+            default_settings.update(integration_settings)
+
+    return default_settings
+
+
+def _get_all_default_settings():
+    """Return the app default settings, including the defaults of every integration, enabled or not."""
+    default_settings = dict(_DEFAULT_SETTINGS)
+    for integration_settings in _INTEGRATIONS_DEFAULT_SETTINGS.values():
+        default_settings.update(integration_settings)
+
+    return default_settings
+
+
+def _build_appconfig():
+    """Check the app requirements and build the app config class.
+
+    Nautobot is only imported here, when Nautobot loads the app through the module `config` attribute,
+    so importing `nautobot_ssot` alone doesn't pull in the Nautobot app machinery.
+    """
+    from nautobot.core.settings_funcs import is_truthy  # pylint: disable=import-outside-toplevel
+    from nautobot.extras.plugins import NautobotAppConfig  # pylint: disable=import-outside-toplevel
+
+    if not is_truthy(os.getenv("NAUTOBOT_SSOT_ALLOW_CONFLICTING_APPS", "False")):
+        _check_for_conflicting_apps()
+
+    _check_min_nautobot_version_met()
+
+    class NautobotSSOTAppConfig(NautobotAppConfig):
+        """App configuration for the nautobot_ssot app."""
+
+        name = "nautobot_ssot"
+        verbose_name = "Single Source of Truth"
+        version = __version__
+        author = "Network to Code, LLC"
+        description = "Nautobot app that enables Single Source of Truth.  Allows users to aggregate distributed data sources and/or distribute Nautobot data to other data sources such as databases and SDN controllers."
+        base_url = "ssot"
+        required_settings = []
+        min_version = "2.0.0"
+        max_version = "2.9999"
+        default_settings = _get_default_settings()
+        caching_config = {}
+        config_view_name = "plugins:nautobot_ssot:config"
+
+        def ready(self):
+            """Trigger callback when database is ready."""
+            super().ready()
+
+            for module in each_enabled_integration_module("signals"):
+                logger.debug("Registering signals for %s", module.__file__)
+                module.register_signals(self)
+
+    NautobotSSOTAppConfig.__qualname__ = NautobotSSOTAppConfig.__name__
+    return NautobotSSOTAppConfig
+
 
-    def ready(self):
-        """Trigger callback when database is ready."""
-        super().ready()
+def __getattr__(name):
+    """Build the app config on first access to `config` or `NautobotSSOTAppConfig`.
 
-        for module in each_enabled_integration_module("signals"):
-            logger.debug("Registering signals for %s", module.__file__)
-            module.register_signals(self)
+    `DEFAULT_SETTINGS` returns the default settings of every integration, as the app config provided them before
+    leaving out the disabled integrations.
+    """
+    if name == "DEFAULT_SETTINGS":
+        return _get_all_default_settings()
 
+    if name in ("config", "NautobotSSOTAppConfig"):
+        try:
+            app_config = _build_appconfig()
+        except AttributeError as err:
+            # Nautobot reports any `AttributeError` raised by `config` as the app not providing it, hiding the cause.
+            raise RuntimeError(f"Unable to build the {__name__} app config: {err}") from err
+        globals().update(config=app_config, NautobotSSOTAppConfig=app_config)
+        return app_config
 
-config = NautobotSSOTAppConfig  # pylint:disable=invalid-name
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,21 +2,78 @@
 
 from django.db import migrations, models
 
+# Single-column change templates, joined into one ALTER TABLE statement per backend.
+ALTER_COLUMN_TEMPLATES = {
+    "postgresql": "ALTER COLUMN {column} TYPE {type} USING {column}::{type}",
+    "mysql": "MODIFY {column} {type} NOT NULL",
+}
+
+
+def _text_fields(model):
+    text_fields = {
+        "message": models.TextField(blank=True),
+        "object_repr": models.TextField(blank=True, default="", editable=False),
+    }
+    for name, field in text_fields.items():
+        field.set_attributes_from_name(name)
+        field.model = model
+
+    return text_fields
+
+
+def _alter_fields(schema_editor, model, fields):
+    connection = schema_editor.connection
+    template = ALTER_COLUMN_TEMPLATES.get(connection.vendor)
+    if template is None:
+        raise ValueError(f"Unsupported database backend: {connection.vendor}")
+
+    quote_name = schema_editor.quote_name
+    changes = ", ".join(
+        template.format(column=quote_name(new_field.column), type=new_field.db_type(connection))
+        for _, new_field in fields
+    )
+    schema_editor.execute(f"ALTER TABLE {quote_name(model._meta.db_table)} {changes}")
+
+
+def alter_synclogentry_textfields(apps, schema_editor):
+    SyncLogEntry = apps.get_model("nautobot_ssot", "SyncLogEntry")
+    fields = [(SyncLogEntry._meta.get_field(name), field) for name, field in _text_fields(SyncLogEntry).items()]
+    _alter_fields(schema_editor, SyncLogEntry, fields)
+
+
+def revert_synclogentry_textfields(apps, schema_editor):
+    SyncLogEntry = apps.get_model("nautobot_ssot", "SyncLogEntry")
+    fields = [(field, SyncLogEntry._meta.get_field(name)) for name, field in _text_fields(SyncLogEntry).items()]
+    _alter_fields(schema_editor, SyncLogEntry, fields)
+
 
 class Migration(migrations.Migration):
+    # Changing the column type copies the whole table on MySQL, don't hold a transaction open for it.
+    atomic = False
+
     dependencies = [
         ("nautobot_ssot", "0002_performance_metrics"),
     ]
 
     operations = [
-        migrations.AlterField(
-            model_name="synclogentry",
-            name="message",
-            field=models.TextField(blank=True),
-        ),
-        migrations.AlterField(
-            model_name="synclogentry",
-            name="object_repr",
-            field=models.TextField(blank=True, default="", editable=False),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(
+                    code=alter_synclogentry_textfields,
+                    reverse_code=revert_synclogentry_textfields,
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="synclogentry",
+                    name="message",
+                    field=models.TextField(blank=True),
+                ),
+                migrations.AlterField(
+                    model_name="synclogentry",
+                    name="object_repr",
+                    field=models.TextField(blank=True, default="", editable=False),
+                ),
+            ],
         ),
     ]
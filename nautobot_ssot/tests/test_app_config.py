@@ -0,0 +1,53 @@
+"""Test the app configuration of nautobot_ssot."""
+
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+import nautobot_ssot
+from nautobot_ssot import _get_default_settings
+
+
+class DefaultSettingsTestCase(SimpleTestCase):
+    """Test the default settings of the app config."""
+
+    @override_settings(PLUGINS_CONFIG={"nautobot_ssot": {"enable_device42": True}})
+    def test_enabled_integration_defaults(self):
+        """Verify that the defaults of enabled integrations are included."""
+        default_settings = _get_default_settings()
+        self.assertTrue(default_settings["device42_use_dns"])
+        self.assertEqual(default_settings["device42_hostname_mapping"], ())
+
+    @override_settings(PLUGINS_CONFIG={"nautobot_ssot": {"enable_device42": True}})
+    def test_disabled_integration_defaults(self):
+        """Verify that the defaults of disabled integrations are left out."""
+        default_settings = _get_default_settings()
+        for key in default_settings:
+            self.assertFalse(key.startswith(("aci_", "aristacv_", "ipfabric_", "servicenow_")), key)
+        self.assertTrue(default_settings["hide_example_jobs"])
+
+    @override_settings(PLUGINS_CONFIG={})
+    def test_missing_app_config(self):
+        """Verify that only the common defaults are returned without any app configuration."""
+        default_settings = _get_default_settings()
+        self.assertFalse(default_settings["enable_aci"])
+        self.assertNotIn("aci_apics", default_settings)
+
+    @override_settings(PLUGINS_CONFIG={})
+    def test_all_default_settings(self):
+        """Verify that the full default settings include the defaults of disabled integrations."""
+        default_settings = nautobot_ssot.DEFAULT_SETTINGS
+        self.assertFalse(default_settings["enable_aci"])
+        self.assertIn("aci_apics", default_settings)
+        self.assertIn("servicenow_instance", default_settings)
+
+
+class AppConfigTestCase(SimpleTestCase):
+    """Test the lazily built app config."""
+
+    def test_build_attribute_error(self):
+        """Verify that an `AttributeError` raised while building the app config isn't reported as a missing attribute."""
+        with patch("nautobot_ssot._build_appconfig", side_effect=AttributeError("missing")):
+            with self.assertRaises(RuntimeError) as context:
+                nautobot_ssot.__getattr__("config")
+        self.assertIsInstance(context.exception.__cause__, AttributeError)
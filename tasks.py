@@ -12,13 +12,30 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import inspect
+import json
 import os
-from pathlib import Path
-from time import sleep
+import shlex
+import subprocess  # nosec: B404
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
+from io import StringIO
+from queue import Empty, Queue
+from threading import Event, Lock, Thread
+from time import monotonic
 
 from invoke.collection import Collection
+from invoke.context import Context
+from invoke.main import program
+from invoke.parser import ParserContext
+from invoke.runners import Local
 from invoke.tasks import task as invoke_task
 
+_TRUTHY_VALUES = {
+    **dict.fromkeys(("y", "yes", "t", "true", "on", "1"), True),
+    **dict.fromkeys(("n", "no", "f", "false", "off", "0"), False),
+}
+
 
 def is_truthy(arg):
     """Convert "truthy" strings into Booleans.
@@ -33,13 +50,10 @@ def is_truthy(arg):
     if isinstance(arg, bool):
         return arg
 
-    val = str(arg).lower()
-    if val in ("y", "yes", "t", "true", "on", "1"):
-        return True
-    elif val in ("n", "no", "f", "false", "off", "0"):
-        return False
-    else:
-        raise ValueError(f"Invalid truthy value: `{arg}`")
+    try:
+        return _TRUTHY_VALUES[str(arg).lower()]
+    except KeyError:
+        raise ValueError(f"Invalid truthy value: `{arg}`") from None
 
 
 # Use pyinvoke configuration for default values, see http://docs.pyinvoke.org/en/stable/concepts/configuration.html
@@ -65,27 +79,139 @@ namespace.configure(
 )
 
 
+@lru_cache(maxsize=None)
+def _included_compose_names(compose_files):
+    """Return the `<name>` part of each included `docker-compose.<name>.yml` file."""
+    prefix, suffix = "docker-compose.", ".yml"
+    return frozenset(
+        compose_file[len(prefix) : -len(suffix)]
+        for compose_file in compose_files
+        if compose_file.startswith(prefix) and compose_file.endswith(suffix)
+    )
+
+
+# Cached `_is_nautobot_running()` results, cleared by the tasks starting or stopping services.
+_NAUTOBOT_RUNNING_TTL = 5
+_nautobot_running = {}
+_nautobot_running_lock = Lock()
+
+# Seconds to wait for containers to become healthy, and between the reports of the containers still waited for.
+_HEALTH_TIMEOUT = 600
+_HEALTH_REPORT_INTERVAL = 30
+
+
 def _is_compose_included(context, name):
-    return f"docker-compose.{name}.yml" in context.nautobot_ssot.compose_files
+    return name in _included_compose_names(tuple(context.nautobot_ssot.compose_files))
+
+
+def _read_compose_ps(output):
+    """Read the containers from the `docker compose ps --format json` output.
+
+    Older docker compose versions print a single JSON array, newer ones print one JSON object per line.
+    """
+    output = output.strip()
+    if output.startswith("["):
+        return json.loads(output)
+
+    return [json.loads(line) for line in output.splitlines() if line]
 
 
 def _await_healthy_service(context, service):
-    container_id = docker_compose(context, f"ps -q -- {service}", pty=False, echo=False, hide=True).stdout.strip()
-    _await_healthy_container(context, container_id)
+    def read_health():
+        output = docker_compose(context, f"ps --format json -- {service}", pty=False, echo=False, hide=True).stdout
+        containers = _read_compose_ps(output)
+        if not containers:
+            raise RuntimeError(f"Service `{service}` has no running container.")
+
+        return {container["ID"]: container["Health"] for container in containers}
+
+    _await_healthy(read_health)
 
 
 def _await_healthy_container(context, container_id):
-    while True:
+    def read_health():
         result = context.run(
-            "docker inspect --format='{{.State.Health.Status}}' " + container_id,
+            "docker inspect --format='{{if .State.Health}}{{.State.Health.Status}}{{end}}' " + container_id,
             pty=False,
             echo=False,
             hide=True,
         )
-        if result.stdout.strip() == "healthy":
-            break
-        print(f"Waiting for `{container_id}` container to become healthy ...")
-        sleep(1)
+        return {container_id: result.stdout.strip()}
+
+    _await_healthy(read_health)
+
+
+def _await_healthy(read_health, timeout=_HEALTH_TIMEOUT):
+    """Wait for containers to become healthy.
+
+    Args:
+        read_health (function): Returns the current health status of the containers, keyed by container ID.
+        timeout (int): Seconds to wait for the containers to become healthy.
+    """
+    command = [
+        "docker",
+        "events",
+        "--filter=type=container",
+        "--filter=event=health_status",
+        "--filter=event=die",
+        "--format={{.Actor.ID}} {{.Action}}",
+    ]
+    # Subscribe to events before the status check, so a status change in between isn't missed.
+    with subprocess.Popen(command, stdout=subprocess.PIPE, text=True) as events:  # nosec: B603
+        try:
+            waiting = set()
+            for container_id, health in read_health().items():
+                if not health:
+                    raise RuntimeError(f"Container `{container_id}` has no healthcheck to wait for.")
+                if health != "healthy":
+                    waiting.add(container_id)
+
+            _await_health_events(events, waiting, timeout)
+        finally:
+            events.terminate()
+
+
+def _await_health_events(events, waiting, timeout):
+    lines = Queue()
+
+    def read_events():
+        for line in events.stdout:
+            lines.put(line)
+        lines.put(None)
+
+    # Read the events in a thread, so the wait can time out when no event comes in.
+    Thread(target=read_events, daemon=True).start()
+
+    deadline = monotonic() + timeout
+    report_at = monotonic()
+    while waiting:
+        if monotonic() >= report_at:
+            for container_id in sorted(waiting):
+                print(f"Waiting for `{container_id}` container to become healthy ...")
+            report_at = monotonic() + _HEALTH_REPORT_INTERVAL
+
+        try:
+            line = lines.get(timeout=max(min(deadline, report_at) - monotonic(), 0))
+        except Empty:
+            if monotonic() >= deadline:
+                raise RuntimeError(
+                    f"Timed out after {timeout} seconds waiting for `{'`, `'.join(sorted(waiting))}` to become healthy."
+                ) from None
+            continue
+
+        if line is None:
+            raise RuntimeError(
+                f"`docker events` exited with code {events.wait()} before the containers became healthy."
+            )
+
+        event_id, _, action = line.strip().partition(" ")
+        for container_id in list(waiting):
+            if not event_id.startswith(container_id):
+                continue
+            if action == "health_status: healthy":
+                waiting.remove(container_id)
+            elif action == "die":
+                raise RuntimeError(f"Container `{container_id}` stopped before becoming healthy.")
 
 
 def _read_command_env(values) -> dict:
@@ -139,6 +265,21 @@ def task(function=None, *args, **kwargs):
     return task_wrapper
 
 
+@lru_cache(maxsize=None)
+def _compose_command_prefix(project_name, compose_dir, compose_files):
+    """Return the "docker compose ..." command prefix with the project and compose files options."""
+    compose_command_tokens = [
+        "docker compose",
+        f"--project-name {shlex.quote(project_name)}",
+        f"--project-directory {shlex.quote(compose_dir)}",
+    ]
+    compose_command_tokens.extend(
+        f" -f {shlex.quote(os.path.join(compose_dir, compose_file))}" for compose_file in compose_files
+    )
+
+    return " ".join(compose_command_tokens)
+
+
 def docker_compose(context, command, **kwargs):
     """Helper function for running a specific docker compose command with all appropriate parameters and environment.
 
@@ -156,28 +297,40 @@ def docker_compose(context, command, **kwargs):
         **kwargs.pop("env", {}),
     }
     compose_command_tokens = [
-        "docker compose",
-        f"--project-name {context.nautobot_ssot.project_name}",
-        f'--project-directory "{context.nautobot_ssot.compose_dir}"',
+        _compose_command_prefix(
+            context.nautobot_ssot.project_name,
+            context.nautobot_ssot.compose_dir,
+            tuple(context.nautobot_ssot.compose_files),
+        ),
+        command,
     ]
 
-    for compose_file in context.nautobot_ssot.compose_files:
-        compose_file_path = os.path.join(context.nautobot_ssot.compose_dir, compose_file)
-        compose_command_tokens.append(f' -f "{compose_file_path}"')
-
-    compose_command_tokens.append(command)
-
     # If `service` was passed as a kwarg, add it to the end.
     service = kwargs.pop("service", None)
     if service is not None:
         compose_command_tokens.append(service)
 
-    print(f'Running docker compose command "{command}"')
+    print(f'Running docker compose command "{command}"', file=context.config.run.out_stream)
     compose_command = " ".join(compose_command_tokens)
 
     return context.run(compose_command, env=build_env, **kwargs)
 
 
+def _is_nautobot_running(context):
+    """Return whether the nautobot service is running, the result is cached for `_NAUTOBOT_RUNNING_TTL` seconds."""
+    project_name = context.nautobot_ssot.project_name
+    # Concurrent callers wait for a single `docker compose ps` instead of each running their own.
+    with _nautobot_running_lock:
+        running, checked_at = _nautobot_running.get(project_name, (False, None))
+        if checked_at is None or monotonic() - checked_at > _NAUTOBOT_RUNNING_TTL:
+            docker_compose_status = "ps --services --filter status=running"
+            results = docker_compose(context, docker_compose_status, hide="out")
+            running = "nautobot" in results.stdout
+            _nautobot_running[project_name] = (running, monotonic())
+
+    return running
+
+
 def run_command(context, command, **kwargs):
     """Wrapper to run a command locally or inside the nautobot container."""
     env = _read_command_env(kwargs.pop("env", None))
@@ -185,9 +338,7 @@ def run_command(context, command, **kwargs):
         return context.run(command, **kwargs, env=env)
 
     # Check if nautobot is running, no need to start another nautobot container to run a command
-    docker_compose_status = "ps --services --filter status=running"
-    results = docker_compose(context, docker_compose_status, hide="out")
-    if "nautobot" in results.stdout:
+    if _is_nautobot_running(context):
         compose_command = "exec"
     else:
         compose_command = "run --rm --entrypoint=''"
@@ -224,11 +375,33 @@ def build(context, force_rm=False, cache=True):
     docker_compose(context, command)
 
 
+_VERSION_FILE_PATH = os.path.join(os.path.dirname(__file__), "nautobot_ssot", "_version.py")
+
+
+@task
+def generate_version_file(context):
+    """Generate the `nautobot_ssot/_version.py` file from the version in `pyproject.toml`."""
+    # Normalize the version the same way as the package metadata, e.g. `1.0.0-beta` becomes `1.0.0b0`.
+    script = (
+        "import toml; from packaging.version import Version; "
+        'print(Version(toml.load("pyproject.toml")["tool"]["poetry"]["version"]))'
+    )
+    version = run_command(context, f"python -c {shlex.quote(script)}", hide=True).stdout.strip()
+    with open(_VERSION_FILE_PATH, "w", encoding="utf-8") as version_file:
+        version_file.write(f'"""Version of nautobot_ssot, generated by `invoke generate-version-file`."""\n\n')
+        version_file.write(f'__version__ = "{version}"\n')
+
+
 @task
 def generate_packages(context):
     """Generate all Python packages inside docker and copy the file locally under dist/."""
+    generate_version_file(context)
     command = "poetry build"
-    run_command(context, command)
+    try:
+        run_command(context, command)
+    finally:
+        # The source tree is mounted in the development containers, don't leave a stale version behind for them.
+        os.remove(_VERSION_FILE_PATH)
 
 
 @task(
@@ -251,6 +424,7 @@ def lock(context, check=False):
 def debug(context, service=""):
     """Start specified or all services and its dependencies in debug mode."""
     print(f"Starting {service} in debug mode...")
+    _nautobot_running.clear()
     docker_compose(context, "up", service=service)
 
 
@@ -258,6 +432,7 @@ def debug(context, service=""):
 def start(context, service=""):
     """Start specified or all services and its dependencies in detached mode."""
     print("Starting Nautobot in detached mode...")
+    _nautobot_running.clear()
     docker_compose(context, "up --detach", service=service)
 
 
@@ -265,6 +440,7 @@ def start(context, service=""):
 def restart(context, service=""):
     """Gracefully restart specified or all services."""
     print("Restarting Nautobot...")
+    _nautobot_running.clear()
     docker_compose(context, "restart", service=service)
 
 
@@ -272,6 +448,7 @@ def restart(context, service=""):
 def stop(context, service=""):
     """Stop specified or all services, if service is not specified, remove all containers."""
     print("Stopping Nautobot...")
+    _nautobot_running.clear()
     docker_compose(context, "stop" if service else "down --remove-orphans", service=service)
 
 
@@ -285,6 +462,7 @@ def stop(context, service=""):
 def destroy(context, volumes=True, import_db_file=""):
     """Destroy all containers and volumes."""
     print("Destroying Nautobot...")
+    _nautobot_running.clear()
     docker_compose(context, f"down --remove-orphans {'--volumes' if volumes else ''}")
 
     if not import_db_file:
@@ -295,8 +473,8 @@ def destroy(context, volumes=True, import_db_file=""):
 
     print(f"Importing database file: {import_db_file}...")
 
-    input_path = Path(import_db_file).absolute()
-    if not input_path.is_file():
+    input_path = os.path.abspath(import_db_file)
+    if not os.path.isfile(input_path):
         raise ValueError(f"File not found: {input_path}")
 
     command = [
@@ -535,6 +713,7 @@ def dbshell(context, db_name="", input_file="", output_file="", query=""):
 )
 def import_db(context, db_name="", input_file="dump.sql"):
     """Stop Nautobot containers and replace the current database with the dump into `db` container."""
+    _nautobot_running.clear()
     docker_compose(context, "stop -- nautobot worker beat")
     start(context, "db")
     _await_healthy_service(context, "db")
@@ -654,13 +833,32 @@ def build_and_check_docs(context):
 @task(name="help")
 def help_task(context):
     """Print the help of available tasks."""
-    import tasks  # pylint: disable=all
-
-    root = Collection.from_module(tasks)
-    for task_name in sorted(root.task_names):
+    for task_name in sorted(namespace.task_names):
         print(50 * "-")
         print(f"invoke {task_name} --help")
-        context.run(f"invoke {task_name} --help")
+        _print_task_help(task_name, namespace[task_name])
+
+
+def _print_task_help(task_name, task_func):
+    """Print the help of a task the same way as `invoke <task> --help`, without starting a new invoke process."""
+    help_tuples = ParserContext(name=task_name, args=task_func.get_arguments()).help_tuples()
+    options = "[--options] " if help_tuples else ""
+    print(f"Usage: {program.binary} [--core-opts] {task_name} {options}[other tasks here ...]")
+    print("")
+    print("Docstring:")
+    docstring = inspect.getdoc(task_func)
+    if docstring:
+        for line in docstring.splitlines():
+            print(f"{program.leading_indent}{line}" if line.strip() else "")
+    else:
+        print(f"{program.leading_indent}none")
+    print("")
+    print("Options:")
+    if help_tuples:
+        program.print_columns(help_tuples)
+    else:
+        print(f"{program.leading_indent}none")
+        print("")
 
 
 @task(
@@ -733,18 +931,25 @@ def autoformat(context):
 )
 def ruff(context, action="lint", fix=False, output_format="text"):
     """Run ruff to perform code formatting and/or linting."""
+    commands = []
     if action != "lint":
         command = "ruff format"
         if not fix:
             command += " --check"
         command += " ."
-        run_command(context, command)
+        commands.append(command)
     if action != "format":
         command = "ruff check"
         if fix:
             command += " --fix"
         command += f" --output-format {output_format} ."
-        run_command(context, command)
+        commands.append(command)
+
+    # Run both actions with a single command, to only go through the Nautobot container once.
+    if len(commands) > 1:
+        run_command(context, f"sh -c {shlex.quote(' && '.join(commands))}")
+    else:
+        run_command(context, commands[0])
 
 
 @task
@@ -781,6 +986,7 @@ def check_migrations(context):
         "buffer": "Discard output from passing tests",
         "pattern": "Run specific test methods, classes, or modules instead of all tests",
         "verbose": "Enable verbose test output.",
+        "parallel": "Run the tests in parallel processes, one per CPU core of the container.",
     }
 )
 def unittest(
@@ -791,9 +997,14 @@ def unittest(
     buffer=True,
     pattern="",
     verbose=False,
+    parallel=False,
 ):
     """Run Nautobot unit tests."""
-    command = f"coverage run --module nautobot.core.cli test {label}"
+    command = "coverage run"
+    if parallel:
+        # Measure each of the test processes, they write a coverage data file each.
+        command += " --rcfile=development/coverage_parallel.toml"
+    command += f" --module nautobot.core.cli test {label}"
 
     if keepdb:
         command += " --keepdb"
@@ -805,6 +1016,11 @@ def unittest(
         command += f" -k='{pattern}'"
     if verbose:
         command += " --verbosity 2"
+    if parallel:
+        # Remove the data files left behind by an earlier run, and combine the data files of this one even when the
+        # tests fail, keeping the exit status of the tests. All within a single command.
+        command = f"coverage erase && {{ {command} --parallel; status=$?; coverage combine; exit $status; }}"
+        command = f"sh -c {shlex.quote(command)}"
 
     run_command(context, command)
 
@@ -817,36 +1033,115 @@ def unittest_coverage(context):
     run_command(context, command)
 
 
+def _run_concurrently(context, tasks, failfast=False):
+    """Run independent tasks concurrently and print the output of each task once it completes.
+
+    Args:
+        context (obj): Used to run specific commands
+        tasks (dict): Task functions to run, keyed by the name to print for each one.
+        failfast (bool): Interrupt the remaining tasks as soon as one of them fails.
+    """
+    runners = set()
+    runners_lock = Lock()
+    interrupted = Event()
+
+    class Runner(Local):
+        """Local runner echoing to the task output, which can be interrupted from the main thread."""
+
+        def echo(self, command):
+            print(self.opts["echo_format"].format(command=command), file=self.streams["out"])
+
+        def start(self, command, shell, env):
+            with runners_lock:
+                if interrupted.is_set():
+                    raise KeyboardInterrupt
+                super().start(command, shell, env)
+                runners.add(self)
+
+        def stop(self):
+            with runners_lock:
+                runners.discard(self)
+            super().stop()
+
+    def interrupt():
+        # Ctrl-C only reaches the main thread, pass it on to the commands running in the worker threads.
+        with runners_lock:
+            interrupted.set()
+            for runner in runners:
+                if runner.using_pty:
+                    runner.send_interrupt(KeyboardInterrupt())
+                else:
+                    runner.kill()
+
+    def run_task(task_func, output):
+        # Each task gets its own context, so the output can be buffered and stdin isn't shared between tasks.
+        task_context = Context(config=context.config.clone())
+        task_context.config.runners.local = Runner
+        # Run the commands in their own pseudo-terminal, for the interrupt to reach every process of the command.
+        task_context.config.run.pty = True
+        task_context.config.run.in_stream = False
+        task_context.config.run.out_stream = output
+        task_context.config.run.err_stream = output
+        task_func(task_context)
+
+    failure = None
+    # The threads only wait for the commands to complete, run all of the tasks at once.
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = {}
+        for name, task_func in tasks.items():
+            output = StringIO()
+            futures[executor.submit(run_task, task_func, output)] = (name, output)
+
+        try:
+            for future in as_completed(futures):
+                name, output = futures[future]
+                print(f"Running {name}...")
+                print(output.getvalue(), end="")
+                if future.exception() and not failure:
+                    failure = future.exception()
+                    if failfast:
+                        interrupt()
+                        break
+        except KeyboardInterrupt:
+            interrupt()
+            raise
+
+    if failure:
+        raise failure
+
+
 @task(
     help={
-        "failfast": "fail as soon as a single test fails don't run the entire test suite. (default: False)",
+        "failfast": "fail as soon as a single linter or test fails don't run the entire test suite. (default: False)",
         "keepdb": "Save and re-use test database between test runs for faster re-testing. (default: False)",
         "lint-only": "Only run linters; unit tests will be excluded. (default: False)",
+        "parallel": "Run the linters concurrently, printing the output of each one once it completes. (default: True)",
     }
 )
-def tests(context, failfast=False, keepdb=False, lint_only=False):
+def tests(context, failfast=False, keepdb=False, lint_only=False, parallel=True):
     """Run all tests for this app."""
     # If we are not running locally, start the docker containers so we don't have to for each test
     if not is_truthy(context.nautobot_ssot.local):
         print("Starting Docker Containers...")
         start(context)
     # Sorted loosely from fastest to slowest
-    print("Running black...")
-    black(context)
-    print("Running ruff...")
-    ruff(context)
-    print("Running flake8...")
-    flake8(context)
-    print("Running bandit...")
-    bandit(context)
-    print("Running yamllint...")
-    yamllint(context)
-    print("Running poetry check...")
-    lock(context, check=True)
-    print("Running migrations check...")
-    check_migrations(context)
-    print("Running pylint...")
-    pylint(context)
+    linters = {
+        "black": black,
+        "ruff": ruff,
+        "flake8": flake8,
+        "bandit": bandit,
+        "yamllint": yamllint,
+        "poetry check": partial(lock, check=True),
+        "migrations check": check_migrations,
+        "pylint": pylint,
+    }
+    if parallel:
+        _run_concurrently(context, linters, failfast=failfast)
+    else:
+        for name, linter in linters.items():
+            print(f"Running {name}...")
+            linter(context)
+    # mkdocs rewrites its site directory inside the source tree the other linters walk, run it once they are done.
     print("Running mkdocs...")
     build_and_check_docs(context)
     print("Checking app config schema...")